@@ -1,43 +1,36 @@
 """"Basic Chunking Layer for PICN"""
 
 import multiprocessing
-import time
-from typing import Dict, List
+from typing import List
 
 from PiCN.Layers.ChunkLayer.Chunkifyer import BaseChunkifyer, SimpleContentChunkifyer
+from PiCN.Layers.ChunkLayer.ContentRange import ContentRange
+from PiCN.Layers.ChunkLayer.RequestTable import RequestTable, RequestTableEntry
+from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreMemoryBounded
 from PiCN.Packets import Content, Interest, Name, Nack
 from PiCN.Processes import LayerProcess
 
 
-class RequestTableEntry(object):
-    """Request table for Pending chunks"""
-
-    def __init__(self, name: Name):
-        self.name: Name = name
-        self.requested_chunks = []
-        self.chunks =[]
-        self.requested_md = []
-        self.chunked = False
-        self.lastchunk:Name
-
-    def __eq__(self, other):
-        return self.name == other.name
-
 class BasicChunkLayer(LayerProcess):
-    """"Basic Chunking Layer for PICN"""
-
-    def __init__(self, chunkifyer: BaseChunkifyer=None, chunk_size: int=4096, manager: multiprocessing.Manager=None,
-                 log_level=255):
+    """"Basic Chunking Layer for PICN
+    The request table and the chunk table are process local, they are indexed by name.
+    Interests from higher marked for streaming ([faceid, interest, True]) are answered with in order byte ranges
+    (ContentRange) as soon as they are contiguous, the content is not reassembled in memory.
+    :param chunk_table_size: maximum number of bytes stored in the chunk table
+    :param chunk_table_timeout: time interval in which chunks are stored in the chunk table
+    """
+
+    def __init__(self, chunkifyer: BaseChunkifyer=None, chunk_size: int=4096, chunk_table_size: int=256*1024*1024,
+                 chunk_table_timeout: int=300, log_level=255):
         super().__init__("ChunkLayer", log_level=log_level)
         self.chunk_size = chunk_size
         if chunkifyer == None:
             self.chunkifyer = SimpleContentChunkifyer(chunk_size)
         else:
             self.chunkifyer: BaseChunkifyer = chunkifyer
-        if manager is None:
-            manager = multiprocessing.Manager()
-        self._chunk_table: Dict[Name, (Content, float)] = manager.dict()
-        self._request_table: List[RequestTableEntry] = manager.list()
+        self._chunk_table: BaseContentStore = ContentStoreMemoryBounded(cs_timeout=chunk_table_timeout,
+                                                                        max_bytes=chunk_table_size)
+        self._request_table: RequestTable = RequestTable()
 
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         self.logger.info("Got Data from higher")
@@ -47,13 +40,14 @@ class BasicChunkLayer(LayerProcess):
             self.logger.info("Packet is Interest " + str(packet.name))
             requestentry = self.get_request_table_entry(packet.name)
             if requestentry is None:
-                self._request_table.append(RequestTableEntry(packet.name))
+                stream = len(data) > 2 and data[2] is True
+                self._request_table.append(RequestTableEntry(packet.name, stream=stream))
             to_lower.put([faceid, packet])
             return
         if isinstance(packet, Content):
             self.logger.info("Packet is Content (name=%s, %d bytes)" % \
-                                      (str(packet.name), len(packet.content)))
-            if len(packet.content) < self.chunk_size:
+                                      (str(packet.name), len(packet.get_bytes())))
+            if len(packet.get_bytes()) < self.chunk_size:
                 to_lower.put([faceid, packet])
             else:
                 self.logger.info("Chunking Packet")
@@ -61,11 +55,9 @@ class BasicChunkLayer(LayerProcess):
                 self.logger.info("Metadata: " + metadata[0].content)
                 to_lower.put([faceid, metadata[0]]) #return first name TODO HANDLE THE CASE, WHERE CHUNKS CAN TIMEOUT AND MUST BE REPRODUCED
                 for md in metadata: #add metadata to chunktable
-                    if md.name not in self._chunk_table:
-                        self._chunk_table[md.name] = (md, time.time())
+                    self._chunk_table.add_content_object(md)
                 for c in chunks: #add chunks to chunktable
-                    if c.name not in self._chunk_table:
-                        self._chunk_table[c.name] = (c, time.time())
+                    self._chunk_table.add_content_object(c)
         if isinstance(packet, Nack):
             requestentry = self.get_request_table_entry(packet.name)
             if requestentry is not None:
@@ -78,9 +70,9 @@ class BasicChunkLayer(LayerProcess):
         packet = data[1]
         if isinstance(packet, Interest):
             self.logger.info("Packet is Interest")
-            if packet.name in self._chunk_table: #Check if Interest is in chunktable
-                matching_content = self._chunk_table.get(packet.name)[0]
-                to_lower.put([faceid, matching_content])
+            cs_entry = self._chunk_table.find_content_object(packet.name)
+            if cs_entry is not None: #Check if Interest is in chunktable
+                to_lower.put([faceid, cs_entry.content])
             else:
                 to_higher.put([faceid, packet])
             return
@@ -89,20 +81,20 @@ class BasicChunkLayer(LayerProcess):
             request_table_entry = self.get_request_table_entry(packet.name)
             if request_table_entry is None:
                 return
-            self._request_table.remove(request_table_entry)
             if request_table_entry.chunked is False: #not chunked content
-                if not packet.get_bytes().startswith(b'mdo:'):
+                if not self.chunkifyer.is_meta_data(packet):
+                    self._request_table.remove(request_table_entry)
                     to_higher.put([faceid, packet])
                     return
                 else: # Received metadata data --> chunked content
                     request_table_entry.chunked = True
-            if packet.get_bytes().startswith(b'mdo:'): # request all frames from metadata
-                request_table_entry = self.handle_received_meta_data(faceid, packet, request_table_entry, to_lower)
-            else:
-                request_table_entry = self.handle_received_chunk_data(faceid, packet, request_table_entry, to_higher)
-                if request_table_entry is None:
-                    return #deletes entry if data was completed
-            self._request_table.append(request_table_entry)
+            if not self.chunkifyer.verify_chunk(packet):
+                self.logger.info("Dropping chunk not matching its name: " + str(packet.name))
+                return
+            if packet.name in request_table_entry.requested_chunks:
+                self.handle_received_chunk_data(faceid, packet, request_table_entry, to_higher)
+            else: # request all frames from metadata
+                self.handle_received_meta_data(faceid, packet, request_table_entry, to_lower)
         if isinstance(packet, Nack):
             requestentry = self.get_request_table_entry(packet.name)
             if requestentry is not None:
@@ -112,86 +104,103 @@ class BasicChunkLayer(LayerProcess):
     def handle_received_meta_data(self, faceid: int, packet: Content, request_table_entry: RequestTableEntry,
                                   to_lower: multiprocessing.Queue) -> RequestTableEntry:
         """Handle the case, where metadata are received from the network"""
-        md_entry = self.metadata_name_in_request_table(packet.name)
-        if md_entry is None:
+        if packet.name != request_table_entry.name and packet.name not in request_table_entry.requested_md:
             return request_table_entry
         request_table_entry = self.remove_metadata_name_from_request_table(request_table_entry, packet.name)
-        md, chunks, size = self.chunkifyer.parse_meta_data(packet.content)
-        if md is not None:  # there is another md file
-            request_table_entry.requested_md.append(md)
+        mds, chunks, size = self.chunkifyer.parse_meta_data_object(request_table_entry.name, packet)
+        if size is not None:
+            request_table_entry.content_size = size
+        if request_table_entry.buffer is None and size is not None and not request_table_entry.stream:
+            # preallocate the reassembly buffer
+            request_table_entry.buffer = self.chunkifyer.create_reassembly_buffer(request_table_entry.content_size)
+        for md in mds:  # request all following md files in parallel
+            self._request_table.add_requested_metadata(request_table_entry, md)
             to_lower.put([faceid, Interest(md)])
-        else:
+        if len(mds) == 0 and len(chunks) > 0:
             request_table_entry.lastchunk = chunks[-1]
         for chunk in chunks:  # request all chunks from the metadata file
-            request_table_entry.requested_chunks.append(chunk)
+            self._request_table.add_requested_chunk(request_table_entry, chunk)
             to_lower.put([faceid, Interest(chunk)])
-        self._chunk_table[packet.name] = (packet, time.time())
+        self._chunk_table.add_content_object(packet)
         return request_table_entry
 
     def handle_received_chunk_data(self, faceid: int, packet: Content, request_table_entry: RequestTableEntry,
                                    to_higher: multiprocessing.Queue) -> RequestTableEntry:
         """Handle the case wehere chunk data are received """
-        chunk_entry = self.chunk_name_in_request_table(packet.name)
-        if chunk_entry is None:
+        if packet.name not in request_table_entry.requested_chunks:
             return request_table_entry
-        request_table_entry.chunks.append(packet)
+        if request_table_entry.stream:
+            return self.handle_received_stream_chunk_data(faceid, packet, request_table_entry, to_higher)
+        if request_table_entry.buffer is not None:  # write the chunk to its slot of the preallocated buffer
+            self.chunkifyer.insert_chunk(request_table_entry.buffer, packet)
+        else:
+            request_table_entry.chunks.append(packet)
         request_table_entry = self.remove_chunk_name_from_request_table_entry(request_table_entry, packet.name)
-        self._chunk_table[packet.name] = (packet, time.time())
+        self._chunk_table.add_content_object(packet)
         if request_table_entry.chunked and len(request_table_entry.requested_chunks) == 0 \
                 and len(request_table_entry.requested_md) == 0:  # all chunks are available
-            data = request_table_entry.chunks
-            #data = sorted(data, key=lambda content: content.name.to_string()) #broken with more than 10 chunks
-            data = sorted(data,
-                          key=lambda content: int(''.join(filter(str.isdigit, content.name.string_components[-1]))))
-            cont = self.chunkifyer.reassamble_data(request_table_entry.name, data)
+            if request_table_entry.buffer is not None:
+                cont = Content(request_table_entry.name, request_table_entry.buffer)
+            else:
+                data = sorted(request_table_entry.chunks,
+                              key=lambda content: self.chunkifyer.get_chunk_number(content.name))
+                cont = self.chunkifyer.reassamble_data(request_table_entry.name, data)
+            self._request_table.remove(request_table_entry)
             to_higher.put([faceid, cont])
             return None
         else:
             return request_table_entry
 
-    def get_chunk_list_from_chunk_table(self, data_names: Name) -> List[Content]:
+    def handle_received_stream_chunk_data(self, faceid: int, packet: Content, request_table_entry: RequestTableEntry,
+                                          to_higher: multiprocessing.Queue) -> RequestTableEntry:
+        """Handle chunk data of a streaming request, contiguous chunks are delivered as one byte range,
+        chunks arriving out of order are kept until the gap before them is closed"""
+        entry = request_table_entry
+        entry.pending_chunks[self.chunkifyer.get_chunk_number(packet.name)] = packet.get_bytes()
+        entry = self.remove_chunk_name_from_request_table_entry(entry, packet.name)
+        data = []
+        while entry.next_chunk in entry.pending_chunks:
+            data.append(entry.pending_chunks.pop(entry.next_chunk))
+            entry.next_chunk += 1
+        complete = len(entry.requested_chunks) == 0 and len(entry.requested_md) == 0
+        if len(data) > 0 or complete:
+            data = b"".join(data)
+            to_higher.put([faceid, ContentRange(entry.name, entry.delivered, data, entry.content_size, complete)])
+            entry.delivered += len(data)
+        if complete:
+            self._request_table.remove(entry)
+            return None
+        return entry
+
+    def get_chunk_list_from_chunk_table(self, data_names: List[Name]) -> List[Content]:
         """get a list of content objects from a list of names"""
         res = []
         for name in data_names:
-            if name in self._chunk_table:
-                res.append(self._chunk_table[name][0])
+            cs_entry = self._chunk_table.find_content_object(name)
+            if cs_entry is not None:
+                res.append(cs_entry.content)
         return res
 
     def get_request_table_entry(self, name: Name) -> RequestTableEntry:
         """check if a name is in the chunktable"""
-        for entry in self._request_table:
-            if entry.name == name or name in entry.requested_chunks or name in entry.requested_md:
-                return entry
-
-        return None
+        return self._request_table.get(name)
 
     def chunk_name_in_request_table(self, name):
         """check if a received chunk is expected by the requesttable"""
-        for entry in self._request_table:
-            if name in entry.requested_chunks:
-                return True
-        return False
+        return self._request_table.is_chunk_requested(name)
 
     def remove_chunk_name_from_request_table_entry(self, request_table_entry: RequestTableEntry, name: Name)\
             -> RequestTableEntry:
         """remove chunk from chunktable"""
-        if name not in request_table_entry.requested_chunks:
-            return request_table_entry
-        request_table_entry.requested_chunks.remove(name)
+        self._request_table.remove_requested_chunk(request_table_entry, name)
         return request_table_entry
 
     def metadata_name_in_request_table(self, name):
         """check if a received metadata is expected by the chunktable"""
-
-        for entry in self._request_table:
-            if name in entry.requested_md:
-                return True
-        return False
+        return self._request_table.is_metadata_requested(name)
 
     def remove_metadata_name_from_request_table(self, request_table_entry: RequestTableEntry, name: Name) \
             -> RequestTableEntry:
         """remove metadata from chunktable"""
-        if name not in request_table_entry.requested_md:
-            return request_table_entry
-        request_table_entry.requested_md.remove(name)
+        self._request_table.remove_requested_metadata(request_table_entry, name)
         return request_table_entry
@@ -1,12 +1,15 @@
 """Superclass for the Chunkifyer"""
 
 import abc
-from typing import List
+from typing import List, Optional
 
 from PiCN.Packets import Packet, Name, Content
 
 class BaseChunkifyer(object):
-    """Superclass für the Chunkifyer"""
+    """Superclass für the Chunkifyer
+    Chunk names end with the component c<chunk number>, the chunk number gives the slot of a chunk in the
+    reassembled content.
+    """
 
     def __init__(self, chunksize = 4096):
         self._chunksize = chunksize
@@ -19,3 +22,33 @@ class BaseChunkifyer(object):
     @abc.abstractmethod
     def reassamble_data(self, name: Name, chunks: List[Content]) -> Packet:
         """Reassamble chunks"""
+
+    @abc.abstractmethod
+    def is_meta_data(self, content: Content) -> bool:
+        """check if a content object is a metadata object"""
+
+    @abc.abstractmethod
+    def parse_meta_data_object(self, name: Name, metadata: Content) -> (List[Name], List[Name], Optional[int]):
+        """parse a metadata object of the content with the given name
+        :return: names of the following metadata objects, names of the chunks, content size (None if unknown)
+        """
+
+    def verify_chunk(self, content: Content) -> bool:
+        """check if a received chunk or metadata object matches its name"""
+        return True
+
+    def get_chunk_number(self, name: Name) -> int:
+        """extract the chunk number from a chunk name (/<name>/c<number>)"""
+        return int(name.components[-1][1:])
+
+    def create_reassembly_buffer(self, content_size: int) -> bytearray:
+        """preallocate a buffer for the reassembled content, chunks are written into it as they arrive"""
+        return bytearray(content_size)
+
+    def insert_chunk(self, buffer: bytearray, chunk: Content):
+        """write a chunk to its slot in a reassembly buffer, the slot is given by the chunk number"""
+        data = chunk.get_bytes()
+        offset = self.get_chunk_number(chunk.name) * self._chunksize
+        if offset + len(data) > len(buffer):
+            raise ValueError("Chunk %s does not fit into the reassembly buffer" % chunk.name.to_string())
+        memoryview(buffer)[offset:offset + len(data)] = data
@@ -1,19 +1,112 @@
-"""FLIC Chunkifyer"""
+"""FLIC Chunkifyer
 
-import abc
-from typing import List
+The content is split into chunks named /<name>/c<chunk number>, the name carries the SHA-256 digest of the chunk
+payload as implicit digest. The chunks are referenced by a tree of manifests (FLIC), a manifest contains the hash
+pointers to up to num_of_ptrs_in_manifest chunks or manifests. Manifests are named /<name>/m with their digest as
+implicit digest, the root manifest is named /<name> and contains the content size. Manifests containing data
+pointers contain the chunk number of their first chunk.
 
-from PiCN.Packets import Packet, Name, Content
+Chunks and manifests are self-certifying: a consumer verifies the digest of all objects except the root manifest.
+"""
 
-class BaseChunkifyer(object):
-    """FLIC Chunkifyer"""
+import hashlib
+from typing import List, Optional
 
-    def __init__(self, chunksize = 4096):
-        self._chunksize = chunksize
-        pass
+from PiCN.Layers.ChunkLayer.Chunkifyer import BaseChunkifyer
+from PiCN.Layers.ChunkLayer.Chunkifyer.flic import NDN_TYPE_MANIFEST, NDN_TYPE_MANIFEST_INDEXTABLE, \
+    NDN_TYPE_MANIFEST_DATAPTR, NDN_TYPE_MANIFEST_MANIFESTPTR, NDN_TYPE_MANIFEST_STARTINDEX, NDN_TYPE_MANIFEST_BYTECOUNT
+from PiCN.Packets import Content, Name
 
-    def chunk_data(self, packet: Packet) -> List[Packet]:
-        """Split packet into chunk"""
+from PiCNExternal.pyndn.encoding.tlv.tlv.tlv_encoder import TlvEncoder
+from PiCNExternal.pyndn.encoding.tlv.tlv.tlv_decoder import TlvDecoder
 
-    def reassamble_data(self, name: Name, chunks: List[Content]) -> Packet:
-        """Reassamble chunks"""
+
+class FlicContentChunkifyer(BaseChunkifyer):
+    """FLIC Chunkifyer
+    :param chunksize: size of a chunk in bytes, manifests are not larger than a chunk
+    :param num_of_ptrs_in_manifest: number of hash pointers in a manifest, None to fill up to the chunk size
+    """
+
+    _PTR_SIZE = 36 # type (3 bytes), length (1 byte), SHA-256 digest
+    _MANIFEST_OVERHEAD = 64 # manifest and index table headers, start index and content size
+
+    def __init__(self, chunksize: int=4096, num_of_ptrs_in_manifest: Optional[int]=None):
+        super().__init__(chunksize)
+        if num_of_ptrs_in_manifest is None:
+            num_of_ptrs_in_manifest = (chunksize - self._MANIFEST_OVERHEAD) // self._PTR_SIZE
+        self._num_of_ptrs_in_manifest = max(2, num_of_ptrs_in_manifest)
+
+    def chunk_data(self, packet: Content) -> (List[Content], List[Content]):
+        """Split content to chunks and generate the manifest tree, the first manifest is the root manifest"""
+        name = packet.name
+        data = packet.get_bytes()
+        chunks = []
+        for i, offset in enumerate(range(0, len(data), self._chunksize)):
+            payload = data[offset:offset + self._chunksize]
+            chunks.append(Content((name + ["c" + str(i)]).setDigest(hashlib.sha256(payload).digest()), payload))
+
+        manifests = []
+        ptr_type = NDN_TYPE_MANIFEST_DATAPTR
+        ptrs = [c.name.digest for c in chunks]
+        while len(ptrs) > self._num_of_ptrs_in_manifest:
+            next_ptrs = []
+            for i in range(0, len(ptrs), self._num_of_ptrs_in_manifest):
+                start_index = i if ptr_type == NDN_TYPE_MANIFEST_DATAPTR else None
+                payload = self.encode_manifest(ptr_type, ptrs[i:i + self._num_of_ptrs_in_manifest], start_index)
+                digest = hashlib.sha256(payload).digest()
+                manifests.append(Content((name + ["m"]).setDigest(digest), payload))
+                next_ptrs.append(digest)
+            ptr_type = NDN_TYPE_MANIFEST_MANIFESTPTR
+            ptrs = next_ptrs
+        start_index = 0 if ptr_type == NDN_TYPE_MANIFEST_DATAPTR else None
+        root = Content(name, self.encode_manifest(ptr_type, ptrs, start_index, len(data)))
+        return [root] + manifests[::-1], chunks
+
+    def reassamble_data(self, name: Name, chunks: List[Content]) -> Content:
+        data = b"".join([d.get_bytes() for d in chunks])
+        return Content(name, data)
+
+    def encode_manifest(self, ptr_type: int, ptrs: List[bytes], start_index: int=None, content_size: int=None) \
+            -> bytes:
+        """encode a manifest containing hash pointers of one type"""
+        encoder = TlvEncoder()
+        for ptr in reversed(ptrs): # fill backwards
+            encoder.writeBlobTlv(ptr_type, ptr)
+        encoder.writeTypeAndLength(NDN_TYPE_MANIFEST_INDEXTABLE, len(encoder))
+        if content_size is not None:
+            encoder.writeNonNegativeIntegerTlv(NDN_TYPE_MANIFEST_BYTECOUNT, content_size)
+        if start_index is not None:
+            encoder.writeNonNegativeIntegerTlv(NDN_TYPE_MANIFEST_STARTINDEX, start_index)
+        encoder.writeTypeAndLength(NDN_TYPE_MANIFEST, len(encoder))
+        return encoder.getOutput().tobytes()
+
+    def is_meta_data(self, content: Content) -> bool:
+        data = content.get_bytes()
+        try:
+            return TlvDecoder(data).peekType(NDN_TYPE_MANIFEST, len(data))
+        except:
+            return False
+
+    def parse_meta_data_object(self, name: Name, metadata: Content) -> (List[Name], List[Name], Optional[int]):
+        decoder = TlvDecoder(metadata.get_bytes())
+        end = decoder.readNestedTlvsStart(NDN_TYPE_MANIFEST)
+        start_index = decoder.readOptionalNonNegativeIntegerTlv(NDN_TYPE_MANIFEST_STARTINDEX, end)
+        content_size = decoder.readOptionalNonNegativeIntegerTlv(NDN_TYPE_MANIFEST_BYTECOUNT, end)
+        table_end = decoder.readNestedTlvsStart(NDN_TYPE_MANIFEST_INDEXTABLE)
+        mds = []
+        chunks = []
+        while decoder.getOffset() < table_end:
+            if decoder.peekType(NDN_TYPE_MANIFEST_DATAPTR, table_end):
+                ptr = bytes(decoder.readBlobTlv(NDN_TYPE_MANIFEST_DATAPTR))
+                chunks.append((name + ["c" + str(start_index + len(chunks))]).setDigest(ptr))
+            else:
+                ptr = bytes(decoder.readBlobTlv(NDN_TYPE_MANIFEST_MANIFESTPTR))
+                mds.append((name + ["m"]).setDigest(ptr))
+        decoder.finishNestedTlvs(table_end)
+        decoder.finishNestedTlvs(end)
+        return (mds, chunks, content_size)
+
+    def verify_chunk(self, content: Content) -> bool:
+        if content.name.digest is None:
+            return True
+        return hashlib.sha256(content.get_bytes()).digest() == content.name.digest
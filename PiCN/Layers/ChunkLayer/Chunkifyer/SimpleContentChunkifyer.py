@@ -1,32 +1,42 @@
 """A simple Chunkifyer for PiCN"""
 
-from typing import List
+from typing import List, Optional, Union
 
 from PiCN.Layers.ChunkLayer.Chunkifyer import BaseChunkifyer
 from PiCN.Packets import Content, Name
 
 
 class SimpleContentChunkifyer(BaseChunkifyer):
+    """A simple Chunkifyer for PiCN
+    The metadata objects form a tree: the metadata object with number i lists its chunk names and the names of the
+    metadata objects i*fanout+1 ... i*fanout+fanout. A consumer can request all of them in parallel and learns all chunk
+    names in O(log n) round trips. With a fanout of 1 the metadata objects are a chain.
+    :param chunksize: size of a chunk in bytes
+    :param num_of_names_in_metadata: number of chunk names in a metadata object, None to fill up to the chunk size
+    :param metadata_fanout: number of metadata objects referenced by a metadata object
+    """
 
-    def __init__(self, chunksize: int=4096):
+    def __init__(self, chunksize: int=4096, num_of_names_in_metadata: Optional[int]=4, metadata_fanout: int=1):
         super().__init__(chunksize)
-        self._num_of_names_in_metadata = 4
+        self._num_of_names_in_metadata = num_of_names_in_metadata
+        self._metadata_fanout = metadata_fanout
 
     def chunk_data(self, packet: Content) -> (List[Content], List[Content]):
         """Split content to chunks and generate metadata"""
         name = packet.name
-        data = packet.content
-        content_size = len(packet.content)
+        data = packet.get_bytes()
+        content_size = len(data)
         chunks = [data[i:i + self._chunksize] for i in range(0, len(data), self._chunksize)]
         num_of_chunks = len(chunks)
+        names_per_md = self.get_num_of_names_in_metadata(name, content_size, num_of_chunks)
+        num_of_md = -(-num_of_chunks // names_per_md)
         meta_data = []
-        for i in range(0, num_of_chunks, self._num_of_names_in_metadata):
-            endindex = min(i+self._num_of_names_in_metadata, num_of_chunks)
-            md_num = int(i/self._num_of_names_in_metadata)
-            next = 0
-            if i + self._num_of_names_in_metadata < num_of_chunks:
-                next = int(i/self._num_of_names_in_metadata)+1
-            meta_data.append(self.generate_meta_data(i, endindex, md_num, next, packet.name, content_size))
+        for md_num in range(0, num_of_md):
+            startindex = md_num * names_per_md
+            endindex = min(startindex + names_per_md, num_of_chunks)
+            first_child = md_num * self._metadata_fanout + 1
+            next = list(range(first_child, min(first_child + self._metadata_fanout, num_of_md)))
+            meta_data.append(self.generate_meta_data(startindex, endindex, md_num, next, packet.name, content_size))
 
         content = []
         for i in range(0, num_of_chunks):
@@ -37,40 +47,58 @@ class SimpleContentChunkifyer(BaseChunkifyer):
 
 
     def reassamble_data(self, name: Name, chunks: List[Content]) -> Content:
-        data = ""
-        for d in chunks:
-            data = data + d.content
+        data = b"".join([d.get_bytes() for d in chunks])
         return Content(name, data)
 
+    def get_num_of_names_in_metadata(self, name: Name, content_size: int, num_of_chunks: int) -> int:
+        """number of chunk names in a metadata object, if not configured as many as fit into a chunk"""
+        if self._num_of_names_in_metadata is not None:
+            return self._num_of_names_in_metadata
+        max_name_len = len(name.to_string()) + len("/c") + len(str(num_of_chunks)) + 1
+        header_len = len("mdo:") + len(str(content_size)) + 2
+        budget = self._chunksize - header_len - self._metadata_fanout * max_name_len
+        return max(1, budget // max_name_len)
 
-    def generate_meta_data(self, startindex: int, endindex: int, md_num: int, next: int, name: Name, content_size: int)\
-            -> Content:
-        """Generate the meta data"""
-        metadata = "mdo:" + str(content_size) + ":"
-        for i in range(startindex, endindex):
-            metadata = metadata + name.to_string() + "/c" + str(i)
-            if i != endindex - 1:
-                metadata = metadata + ";"
-        metadata = metadata + ":"
-        if next > 0:
-            metadata = metadata + name.to_string() + "/m" + str(next)
-        md_name = name.to_string()
+    def generate_meta_data(self, startindex: int, endindex: int, md_num: int, next: Union[int, List[int]], name: Name,
+                           content_size: int) -> Content:
+        """Generate the meta data, next is the number of the following metadata object (0 for none) or a list of
+        numbers of the child metadata objects"""
+        name_str = name.to_string()
+        if isinstance(next, int):
+            next = [next] if next > 0 else []
+        chunk_names = ";".join([name_str + "/c" + str(i) for i in range(startindex, endindex)])
+        next_names = ";".join([name_str + "/m" + str(n) for n in next])
+        metadata = "mdo:" + str(content_size) + ":" + chunk_names + ":" + next_names
+        md_name = name_str
         if md_num > 0:
             md_name = md_name +  "/m" + str(md_num)
         md_name_obj = Name(md_name)
         metadata_obj = Content(md_name_obj, metadata.encode('ascii'))
         return metadata_obj
 
+    def is_meta_data(self, content: Content) -> bool:
+        return content.get_bytes().startswith(b'mdo:')
+
+    def parse_meta_data_object(self, name: Name, metadata: Content) -> (List[Name], List[Name], Optional[int]):
+        mds, names, content_size = self.parse_meta_data_tree(metadata.content)
+        return (mds, names, int(content_size))
+
     def parse_meta_data(self, data: str) -> (Name, List[Name], int):
-        """parse the meta data"""
+        """parse the meta data, returns the first following metadata name only"""
+        mds, names, content_size = self.parse_meta_data_tree(data)
+        md = None
+        if len(mds) > 0:
+            md = mds[0]
+        return (md, names, content_size)
+
+    def parse_meta_data_tree(self, data: str) -> (List[Name], List[Name], int):
+        """parse the meta data, returns the names of all child metadata objects"""
         parts = data.split(":")
         content_size = parts[1]
         chunknames = parts[2].split(";")
         next_md = parts[3]
         names = [Name(s) for s in chunknames]
-        md = None
+        mds = []
         if next_md != "":
-            md = Name(next_md)
-        return (md, names, content_size)
-
-
+            mds = [Name(s) for s in next_md.split(";")]
+        return (mds, names, content_size)
@@ -2,4 +2,5 @@
 
 from .BaseChunkifyer import BaseChunkifyer
 
-from .SimpleContentChunkifyer import SimpleContentChunkifyer
\ No newline at end of file
+from .SimpleContentChunkifyer import SimpleContentChunkifyer
+from .FlicContentChunkifyer import FlicContentChunkifyer
\ No newline at end of file
@@ -14,6 +14,8 @@ NDN_TYPE_MANIFEST             = 0x990
 NDN_TYPE_MANIFEST_INDEXTABLE  = 0x991
 NDN_TYPE_MANIFEST_DATAPTR     = 0x992
 NDN_TYPE_MANIFEST_MANIFESTPTR = 0x993
+NDN_TYPE_MANIFEST_STARTINDEX  = 0x994
+NDN_TYPE_MANIFEST_BYTECOUNT   = 0x995
 
 # ----------------------------------------------------------------------
 
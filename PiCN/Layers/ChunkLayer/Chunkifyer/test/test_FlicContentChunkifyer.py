@@ -0,0 +1,71 @@
+"""Test for the FLIC Content Chunkifyer"""
+
+import hashlib
+import unittest
+
+from PiCN.Layers.ChunkLayer.Chunkifyer import FlicContentChunkifyer
+from PiCN.Packets import Content, Name
+
+
+class test_FlicContentChunkifyer(unittest.TestCase):
+
+    def setUp(self):
+        self.chunkifyer = FlicContentChunkifyer(chunksize=100, num_of_ptrs_in_manifest=2)
+
+    def tearDown(self):
+        pass
+
+    def get_all_chunk_names(self, name: Name, manifests):
+        """walk the manifest tree breadth first and return the chunk names"""
+        manifest_table = {m.name: m for m in manifests}
+        chunk_names = []
+        queue = [manifests[0].name]
+        while len(queue) > 0:
+            mds, chunks, _ = self.chunkifyer.parse_meta_data_object(name, manifest_table[queue.pop(0)])
+            queue += mds
+            chunk_names += chunks
+        return chunk_names
+
+    def test_chunk_names_with_implicit_digest(self):
+        """Test that chunks are named by chunk number and implicit digest"""
+        name = Name("/test/data")
+        md, chunks = self.chunkifyer.chunk_data(Content(name, "A" * 100 + "B" * 50))
+
+        self.assertEqual(len(md), 1)
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[1].name.components, [b"test", b"data", b"c1"])
+        self.assertEqual(chunks[1].name.digest, hashlib.sha256(b"B" * 50).digest())
+        self.assertTrue(self.chunkifyer.verify_chunk(chunks[1]))
+        self.assertFalse(self.chunkifyer.verify_chunk(Content(chunks[1].name, "C" * 50)))
+
+        self.assertEqual(md[0].name, name)
+        self.assertTrue(self.chunkifyer.is_meta_data(md[0]))
+        self.assertFalse(self.chunkifyer.is_meta_data(chunks[0]))
+        mds, chunk_names, size = self.chunkifyer.parse_meta_data_object(name, md[0])
+        self.assertEqual(mds, [])
+        self.assertEqual(chunk_names, [c.name for c in chunks])
+        self.assertEqual(size, 150)
+
+    def test_manifest_tree(self):
+        """Test that a manifest tree references all chunks in order"""
+        name = Name("/test/data")
+        data = bytes(range(256)) * 10
+        md, chunks = self.chunkifyer.chunk_data(Content(name, data))
+
+        self.assertEqual(len(chunks), 26)
+        self.assertEqual(len(md), 1 + 2 + 4 + 7 + 13)
+        for m in md:
+            self.assertLessEqual(len(m.get_bytes()), 100)
+            self.assertTrue(self.chunkifyer.verify_chunk(m))
+        self.assertEqual(self.get_all_chunk_names(name, md), [c.name for c in chunks])
+        self.assertEqual(self.chunkifyer.parse_meta_data_object(name, md[0])[2], len(data))
+
+    def test_reassemble_into_buffer(self):
+        """Test reassembling chunks into a preallocated buffer"""
+        name = Name("/test/data")
+        content = Content(name, bytes(range(256)) * 10)
+        md, chunks = self.chunkifyer.chunk_data(content)
+        buffer = self.chunkifyer.create_reassembly_buffer(self.chunkifyer.parse_meta_data_object(name, md[0])[2])
+        for c in reversed(chunks):
+            self.chunkifyer.insert_chunk(buffer, c)
+        self.assertEqual(Content(name, buffer), content)
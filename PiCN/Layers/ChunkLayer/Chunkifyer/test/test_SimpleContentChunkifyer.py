@@ -144,4 +144,60 @@ class test_SimpleContentChunkifyer(unittest.TestCase):
         self.assertEqual(None, md)
         names_comp = [Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2"), Name("/test/data/c3")]
         self.assertEqual(names, names_comp)
-        self.assertEqual(int(size), 300)
\ No newline at end of file
+        self.assertEqual(int(size), 300)
+    def test_reassemble_into_buffer_out_of_order(self):
+        """Test reassembling binary chunks, arriving out of order, into a preallocated buffer"""
+        name = Name("/test/data")
+        data = bytes(range(256)) * 100
+        content = Content(name, data)
+
+        md, chunked_content = self.chunkifyer.chunk_data(content)
+        self.assertEqual(self.chunkifyer.get_chunk_number(chunked_content[6].name), 6)
+
+        _, _, size = self.chunkifyer.parse_meta_data(md[0].content)
+        buffer = self.chunkifyer.create_reassembly_buffer(int(size))
+        for c in reversed(chunked_content):
+            self.chunkifyer.insert_chunk(buffer, c)
+
+        self.assertEqual(Content(name, buffer), content)
+
+    def test_chunk_metadata_tree(self):
+        """Test chunking with a metadata tree with fanout 2 and 2 names per metadata object"""
+        chunkifyer = SimpleContentChunkifyer(4096, num_of_names_in_metadata=2, metadata_fanout=2)
+        name = Name("/test/data")
+        content = Content(name, "A" * 4096 * 9 + "B" * 100)
+
+        md, chunked_content = chunkifyer.chunk_data(content)
+
+        md_name_comp = ['/test/data', '/test/data/m1', '/test/data/m2', '/test/data/m3', '/test/data/m4']
+        md_data_comp = ['mdo:36964:/test/data/c0;/test/data/c1:/test/data/m1;/test/data/m2',
+                        'mdo:36964:/test/data/c2;/test/data/c3:/test/data/m3;/test/data/m4',
+                        'mdo:36964:/test/data/c4;/test/data/c5:',
+                        'mdo:36964:/test/data/c6;/test/data/c7:',
+                        'mdo:36964:/test/data/c8;/test/data/c9:']
+        self.assertEqual(len(md), 5)
+        self.assertEqual(len(chunked_content), 10)
+        for i in range(0, len(md)):
+            self.assertEqual(md[i].name.to_string(), md_name_comp[i])
+            self.assertEqual(md[i].content, md_data_comp[i])
+
+        mds, names, size = chunkifyer.parse_meta_data_tree(md[0].content)
+        self.assertEqual(mds, [Name("/test/data/m1"), Name("/test/data/m2")])
+        self.assertEqual(names, [Name("/test/data/c0"), Name("/test/data/c1")])
+        self.assertEqual(int(size), 36964)
+
+    def test_chunk_mtu_sized_metadata(self):
+        """Test that metadata objects are filled up to the chunk size if the number of names is not configured"""
+        chunkifyer = SimpleContentChunkifyer(4096, num_of_names_in_metadata=None, metadata_fanout=4)
+        name = Name("/test/data")
+        content = Content(name, b"A" * 4096 * 1000)
+
+        md, chunked_content = chunkifyer.chunk_data(content)
+
+        self.assertEqual(len(chunked_content), 1000)
+        self.assertLess(len(md), 10)
+        names = []
+        for m in md:
+            self.assertLessEqual(len(m.get_bytes()), 4096)
+            names += chunkifyer.parse_meta_data_tree(m.content)[1]
+        self.assertEqual(names, [c.name for c in chunked_content])
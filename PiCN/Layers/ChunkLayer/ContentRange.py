@@ -0,0 +1,24 @@
+"""Contiguous byte range of a chunked content object"""
+
+from PiCN.Packets import Name
+
+
+class ContentRange(object):
+    """Contiguous byte range of a chunked content object, delivered in order to the higher layer for streaming
+    requests. The ranges of a content object follow each other without gaps, the last range has last set.
+    :param name: name of the content object
+    :param offset: offset of the range in the content object
+    :param data: bytes of the range
+    :param content_size: size of the whole content object, None if unknown
+    :param last: True if this is the last range of the content object
+    """
+
+    def __init__(self, name: Name, offset: int, data: bytes, content_size: int=None, last: bool=False):
+        self.name = name
+        self.offset = offset
+        self.data = data
+        self.content_size = content_size
+        self.last = last
+
+    def __len__(self):
+        return len(self.data)
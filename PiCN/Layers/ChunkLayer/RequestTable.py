@@ -0,0 +1,100 @@
+"""Request table of the chunk layer"""
+
+from typing import Dict
+
+from PiCN.Packets import Name
+
+
+class RequestTableEntry(object):
+    """Request table for Pending chunks"""
+
+    def __init__(self, name: Name, stream: bool=False):
+        self.name: Name = name
+        self.requested_chunks: Dict[Name, None] = {} # ordered set of outstanding chunk names
+        self.chunks =[]
+        self.requested_md: Dict[Name, None] = {} # ordered set of outstanding metadata names
+        self.chunked = False
+        self.lastchunk:Name
+        self.content_size: int = None
+        self.buffer: bytearray = None
+        self.stream = stream # deliver the content as in order byte ranges
+        self.pending_chunks: Dict[int, bytes] = {} # chunks of a stream arrived out of order, by chunk number
+        self.next_chunk = 0 # number of the next chunk to be delivered to a stream
+        self.delivered = 0 # number of bytes delivered to a stream
+
+    def __eq__(self, other):
+        return self.name == other.name
+
+
+class RequestTable(object):
+    """Process local request table of the chunk layer.
+    Entries are indexed by the name of the request and by the names of their outstanding chunks and metadata,
+    lookups for an arriving packet do not depend on the number of outstanding requests or chunks.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Name, RequestTableEntry] = {}
+        self._chunk_index: Dict[Name, RequestTableEntry] = {}
+        self._md_index: Dict[Name, RequestTableEntry] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(list(self._entries.values()))
+
+    def append(self, entry: RequestTableEntry):
+        """add an entry and index its outstanding chunk and metadata names"""
+        self._entries[entry.name] = entry
+        for name in entry.requested_chunks:
+            self._chunk_index[name] = entry
+        for name in entry.requested_md:
+            self._md_index[name] = entry
+
+    def remove(self, entry: RequestTableEntry):
+        """remove an entry and all its indexed names"""
+        entry = self._entries.pop(entry.name, None)
+        if entry is None:
+            return
+        for name in entry.requested_chunks:
+            if self._chunk_index.get(name) is entry:
+                del self._chunk_index[name]
+        for name in entry.requested_md:
+            if self._md_index.get(name) is entry:
+                del self._md_index[name]
+
+    def get(self, name: Name) -> RequestTableEntry:
+        """find the entry, which requested a name, a chunk or a metadata object"""
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry
+        entry = self._chunk_index.get(name)
+        if entry is not None:
+            return entry
+        return self._md_index.get(name)
+
+    def is_chunk_requested(self, name: Name) -> bool:
+        return name in self._chunk_index
+
+    def is_metadata_requested(self, name: Name) -> bool:
+        return name in self._md_index
+
+    def add_requested_chunk(self, entry: RequestTableEntry, name: Name):
+        entry.requested_chunks[name] = None
+        if self._entries.get(entry.name) is entry:
+            self._chunk_index[name] = entry
+
+    def remove_requested_chunk(self, entry: RequestTableEntry, name: Name):
+        entry.requested_chunks.pop(name, None)
+        if self._chunk_index.get(name) is entry:
+            del self._chunk_index[name]
+
+    def add_requested_metadata(self, entry: RequestTableEntry, name: Name):
+        entry.requested_md[name] = None
+        if self._entries.get(entry.name) is entry:
+            self._md_index[name] = entry
+
+    def remove_requested_metadata(self, entry: RequestTableEntry, name: Name):
+        entry.requested_md.pop(name, None)
+        if self._md_index.get(name) is entry:
+            del self._md_index[name]
@@ -5,6 +5,8 @@ reassable all chunks to a packet
     * to_higher expects a packet [0, packet]
     * from_lower expects a chunk of a packet [0, packet]
     * from_higher expects a packet [0, packet]
+    * from_higher accepts [0, interest, True] to request streaming delivery, to_higher
+      then carries the content as in order byte ranges [0, ContentRange]
 
 the data structure of a chunk is the same as of a packet,
 but has a limited size.
@@ -13,4 +15,6 @@ The name must not be chunked, while the name payload can be chunked.
 """
 
 from .BasicChunkLayer import BasicChunkLayer
-from .BasicChunkLayer import RequestTableEntry
\ No newline at end of file
+from .BasicChunkLayer import RequestTableEntry
+from .RequestTable import RequestTable
+from .ContentRange import ContentRange
@@ -7,9 +7,9 @@ import unittest
 from queue import Queue
 
 from PiCN.Layers.ChunkLayer import BasicChunkLayer
-from PiCN.Layers.ChunkLayer import RequestTableEntry
+from PiCN.Layers.ChunkLayer import RequestTableEntry, ContentRange
 
-from PiCN.Layers.ChunkLayer.Chunkifyer import SimpleContentChunkifyer
+from PiCN.Layers.ChunkLayer.Chunkifyer import SimpleContentChunkifyer, FlicContentChunkifyer
 from PiCN.Packets import Content, Interest, Name, Nack, NackReason
 
 
@@ -60,8 +60,8 @@ class test_BasicChunkLayer(unittest.TestCase):
         rte1 = RequestTableEntry(n1)
         rte2 = RequestTableEntry(n2)
 
-        rte1.requested_chunks = [Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2")]
-        rte2.requested_chunks = [Name("/data/test/c0"), Name("/data/test/c1"), Name("/data/test/c2")]
+        rte1.requested_chunks = dict.fromkeys([Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2")])
+        rte2.requested_chunks = dict.fromkeys([Name("/data/test/c0"), Name("/data/test/c1"), Name("/data/test/c2")])
 
         self.chunkLayer._request_table.append(rte1)
         self.chunkLayer._request_table.append(rte2)
@@ -75,13 +75,13 @@ class test_BasicChunkLayer(unittest.TestCase):
         c6 = Content("/data/test/c2", "dtc2")
 
 
-        self.chunkLayer._chunk_table[c1.name] = (c1, time.time())
-        self.chunkLayer._chunk_table[c2.name] = (c2, time.time())
-        self.chunkLayer._chunk_table[c3.name] = (c3, time.time())
+        self.chunkLayer._chunk_table.add_content_object(c1)
+        self.chunkLayer._chunk_table.add_content_object(c2)
+        self.chunkLayer._chunk_table.add_content_object(c3)
 
-        self.chunkLayer._chunk_table[c4.name] = (c4, time.time())
-        self.chunkLayer._chunk_table[c5.name] = (c5, time.time())
-        self.chunkLayer._chunk_table[c6.name] = (c6, time.time())
+        self.chunkLayer._chunk_table.add_content_object(c4)
+        self.chunkLayer._chunk_table.add_content_object(c5)
+        self.chunkLayer._chunk_table.add_content_object(c6)
 
 
         chunks1 = self.chunkLayer.get_chunk_list_from_chunk_table(rte1.requested_chunks)
@@ -104,8 +104,8 @@ class test_BasicChunkLayer(unittest.TestCase):
         rte1 = RequestTableEntry(n1)
         rte2 = RequestTableEntry(n2)
 
-        rte1.requested_chunks = [Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2")]
-        rte2.requested_chunks = [Name("/data/test/c0"), Name("/data/test/c1"), Name("/data/test/c2")]
+        rte1.requested_chunks = dict.fromkeys([Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2")])
+        rte2.requested_chunks = dict.fromkeys([Name("/data/test/c0"), Name("/data/test/c1"), Name("/data/test/c2")])
 
         self.chunkLayer._request_table.append(rte1)
         self.chunkLayer._request_table.append(rte2)
@@ -136,8 +136,8 @@ class test_BasicChunkLayer(unittest.TestCase):
         rte1 = RequestTableEntry(n1)
         rte2 = RequestTableEntry(n2)
 
-        rte1.requested_md = [Name("/test/data/m0"), Name("/test/data/m1"), Name("/test/data/m2")]
-        rte2.requested_md = [Name("/data/test/m0"), Name("/data/test/m1"), Name("/data/test/m2")]
+        rte1.requested_md = dict.fromkeys([Name("/test/data/m0"), Name("/test/data/m1"), Name("/test/data/m2")])
+        rte2.requested_md = dict.fromkeys([Name("/data/test/m0"), Name("/data/test/m1"), Name("/data/test/m2")])
 
         self.chunkLayer._request_table.append(rte1)
         self.chunkLayer._request_table.append(rte2)
@@ -170,10 +170,10 @@ class test_BasicChunkLayer(unittest.TestCase):
 
         request_table_entry = self.chunkLayer.handle_received_meta_data(0, md1, request_table_entry, self.q1_to_lower)
 
-        self.assertEqual(request_table_entry.requested_md[0], Name("/test/data/m1"))
+        self.assertEqual(list(request_table_entry.requested_md)[0], Name("/test/data/m1"))
         chunknames =  [Name("/test/data/c0"), Name("/test/data/c1"), Name("/test/data/c2"), Name("/test/data/c3"),
                        Name("/test/data/c4")]
-        self.assertEqual(request_table_entry.requested_chunks, chunknames[:4])
+        self.assertEqual(list(request_table_entry.requested_chunks), chunknames[:4])
 
         d1 = self.q1_to_lower.get()[1]
         self.assertEqual(d1.name, Name("/test/data/m1"))
@@ -185,7 +185,7 @@ class test_BasicChunkLayer(unittest.TestCase):
         request_table_entry = self.chunkLayer.handle_received_meta_data(0, md2, request_table_entry, self.q1_to_lower)
         self.assertEqual(len(request_table_entry.requested_md), 0)
         self.assertEqual(len(request_table_entry.requested_chunks), 5)
-        self.assertEqual(request_table_entry.requested_chunks, chunknames)
+        self.assertEqual(list(request_table_entry.requested_chunks), chunknames)
         try:
             d3 = self.q1_to_lower.get(timeout=2.0)[1]
         except:
@@ -204,14 +204,14 @@ class test_BasicChunkLayer(unittest.TestCase):
         request_table_entry = RequestTableEntry(n1)
         request_table_entry.chunked = True
 
-        request_table_entry.requested_chunks.append(chunk1_n)
-        request_table_entry.requested_chunks.append(chunk2_n)
+        request_table_entry.requested_chunks[chunk1_n] = None
+        request_table_entry.requested_chunks[chunk2_n] = None
 
         chunk1 = Content(chunk1_n, "chunk1")
         chunk2 = Content(chunk2_n, "chunk2")
 
         request_table_entry = self.chunkLayer.handle_received_chunk_data(0, chunk1, request_table_entry, self.q1_to_higher)
-        self.assertEqual(request_table_entry.requested_chunks, [chunk2_n])
+        self.assertEqual(list(request_table_entry.requested_chunks), [chunk2_n])
 
         request_table_entry = self.chunkLayer.handle_received_chunk_data(0, chunk2, request_table_entry, self.q1_to_higher)
         self.assertEqual(request_table_entry, None)
@@ -237,11 +237,11 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_interest_from_lower_match(self):
         """Test handling interest from lower with chunk entry"""
-        self.chunkLayer.start_process()
         n = Name("/test/data/c0")
         i = Interest(n)
         c = Content(n, "dataobject")
-        self.chunkLayer._chunk_table[c.name] = (c, time.time())
+        self.chunkLayer._chunk_table.add_content_object(c)
+        self.chunkLayer.start_process()
         self.chunkLayer.queue_from_lower.put([0, i])
         try:
             data = self.chunkLayer.queue_to_lower.get(timeout=2.0)
@@ -251,27 +251,26 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_interest_from_higher_no_entry(self):
         """Test handling interest from higher with no request entry"""
-        self.chunkLayer.start_process()
         i = Interest("/test/data")
-        self.chunkLayer.queue_from_higher.put([0, i])
+        self.chunkLayer.data_from_higher(self.q1_to_lower, self.q1_to_higher, [0, i])
         try:
             data = self.chunkLayer.queue_to_lower.get(timeout=2.0)
         except:
             self.fail()
         self.assertEqual(i, data[1])
-        self.assertEqual(self.chunkLayer._request_table[0], RequestTableEntry(i.name))
+        self.assertEqual(list(self.chunkLayer._request_table)[0], RequestTableEntry(i.name))
 
     def test_interest_from_higher_entry(self):
         """Test handling interest from higher with request entry"""
-        self.chunkLayer.start_process()
         i = Interest("/test/data")
         self.chunkLayer._request_table.append(RequestTableEntry(i.name))
-        self.chunkLayer.queue_from_higher.put([0, i])
+        self.chunkLayer.data_from_higher(self.q1_to_lower, self.q1_to_higher, [0, i])
         time.sleep(1)
         res = self.chunkLayer.queue_to_lower.get()
         self.assertEqual(res[1], i)
         self.assertTrue(self.chunkLayer.queue_to_lower.empty())
-        self.assertEqual(self.chunkLayer._request_table[0], RequestTableEntry(i.name))
+        self.assertEqual(len(self.chunkLayer._request_table), 1)
+        self.assertEqual(list(self.chunkLayer._request_table)[0], RequestTableEntry(i.name))
 
     def test_content_from_higher_no_chunk(self):
         """Test handling content from higher"""
@@ -306,9 +305,9 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_content_from_lower_layer(self):
         """Test handling content from lower"""
-        self.chunkLayer.start_process()
         n1 = Name("/test/data")
         self.chunkLayer._request_table.append(RequestTableEntry(n1))
+        self.chunkLayer.start_process()
         c1 = Content(n1, "data")
         self.chunkLayer.queue_from_lower.put([0, c1])
         try:
@@ -320,7 +319,6 @@ class test_BasicChunkLayer(unittest.TestCase):
 
     def test_metadata_from_lower_layer(self):
         """test receiving metadata from lower layer"""
-        self.chunkLayer.start_process()
         md1_n = Name("/test/data")
         md1 = Content(md1_n, "mdo:300:/test/data/c0;/test/data/c1;/test/data/c2;/test/data/c3:/test/data/m1")
         md2_n = Name("/test/data/m1")
@@ -328,7 +326,7 @@ class test_BasicChunkLayer(unittest.TestCase):
 
         self.chunkLayer._request_table.append(RequestTableEntry(md1_n))
 
-        self.chunkLayer.queue_from_lower.put([0, md1])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md1])
 
         data = self.chunkLayer.queue_to_lower.get()
         self.assertEqual(Interest(md2_n), data[1])
@@ -343,10 +341,10 @@ class test_BasicChunkLayer(unittest.TestCase):
         self.assertTrue(self.chunkLayer.queue_to_lower.empty())
 
         request: RequestTableEntry = self.chunkLayer.get_request_table_entry(md1_n)
-        self.assertEqual(request.requested_chunks, chunknames[:4])
-        self.assertEqual(request.requested_md[0], md2_n)
+        self.assertEqual(list(request.requested_chunks), chunknames[:4])
+        self.assertEqual(list(request.requested_md)[0], md2_n)
 
-        self.chunkLayer.queue_from_lower.put([0, md2])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md2])
         try:
             data = self.chunkLayer.queue_to_lower.get(timeout=2.0)
         except:
@@ -360,11 +358,10 @@ class test_BasicChunkLayer(unittest.TestCase):
 
         self.assertEqual(len(request.requested_md), 0)
         self.assertEqual(len(request.requested_chunks), 5)
-        self.assertEqual(request.requested_chunks, chunknames)
+        self.assertEqual(list(request.requested_chunks), chunknames)
 
     def test_chunk_from_lower_layer(self):
         """test receiving metadata from lower layer"""
-        self.chunkLayer.start_process()
 
         n1 = Name("/test/data")
         re1 = RequestTableEntry(n1)
@@ -376,10 +373,11 @@ class test_BasicChunkLayer(unittest.TestCase):
         chunk1 = Content(chunk1_n, "chunk1")
         chunk2 = Content(chunk2_n, "chunk2")
 
-        re1.requested_chunks.append(chunk1_n)
-        re1.requested_chunks.append(chunk2_n)
+        re1.requested_chunks[chunk1_n] = None
+        re1.requested_chunks[chunk2_n] = None
 
         self.chunkLayer._request_table.append(re1)
+        self.chunkLayer.start_process()
 
         self.chunkLayer.queue_from_lower.put([0, chunk2])
         time.sleep(1)
@@ -418,3 +416,73 @@ class test_BasicChunkLayer(unittest.TestCase):
             self.fail()
         self.assertEqual(data[0], 1)
         self.assertEqual(data[1], nack1)
+
+    def test_metadata_tree_from_lower_layer(self):
+        """Test receiving a tree of metadata objects, all child metadata objects are requested in parallel"""
+        self.chunkLayer.chunkifyer = SimpleContentChunkifyer(4096, num_of_names_in_metadata=2, metadata_fanout=2)
+        n1 = Name("/test/data")
+        content = Content(n1, "A" * 4096 * 9 + "B" * 100)
+        md, chunks = self.chunkLayer.chunkifyer.chunk_data(content)
+        self.chunkLayer._request_table.append(RequestTableEntry(n1))
+
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md[0]])
+        requested = [self.q1_to_lower.get(timeout=2.0)[1].name for i in range(0, 4)]
+        self.assertEqual(requested, [Name("/test/data/m1"), Name("/test/data/m2"), chunks[0].name, chunks[1].name])
+
+        for m in md[1:]:
+            self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, m])
+        for c in reversed(chunks):
+            self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, c])
+
+        data = self.q1_to_higher.get(timeout=2.0)[1]
+        self.assertEqual(data, content)
+        self.assertEqual(len(self.chunkLayer._request_table), 0)
+
+    def test_flic_manifest_tree_from_lower_layer(self):
+        """Test receiving content chunked with FLIC manifests, chunks not matching their digest are dropped"""
+        self.chunkLayer.chunkifyer = FlicContentChunkifyer(chunksize=100, num_of_ptrs_in_manifest=2)
+        n1 = Name("/test/data")
+        content = Content(n1, bytes(range(256)) * 10)
+        md, chunks = self.chunkLayer.chunkifyer.chunk_data(content)
+        objects = {c.name: c for c in md + chunks}
+        self.chunkLayer._request_table.append(RequestTableEntry(n1))
+
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md[0]])
+        requested = [self.q1_to_lower.get(timeout=2.0)[1].name for i in range(0, 2)]
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher,
+                                        [0, Content(requested[0], objects[requested[0]].get_bytes()[:-1])])
+        self.assertTrue(self.chunkLayer.chunk_name_in_request_table(requested[0]) or
+                        self.chunkLayer.metadata_name_in_request_table(requested[0]))
+        while not self.q1_to_lower.empty() or len(requested) > 0:
+            while not self.q1_to_lower.empty():
+                requested.append(self.q1_to_lower.get()[1].name)
+            name = requested.pop()
+            self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, objects[name]])
+            time.sleep(0.01)
+
+        data = self.q1_to_higher.get(timeout=2.0)[1]
+        self.assertEqual(data, content)
+        self.assertEqual(len(self.chunkLayer._request_table), 0)
+
+    def test_stream_from_lower_layer(self):
+        """Test streaming delivery, contiguous byte ranges are delivered in order while chunks arrive out of order"""
+        n1 = Name("/test/data")
+        content = Content(n1, "A" * 4096 + "B" * 4096 + "C" * 4096 + "D" * 100)
+        md, chunks = self.chunkLayer.chunkifyer.chunk_data(content)
+        self.chunkLayer.data_from_higher(self.q1_to_lower, self.q1_to_higher, [0, Interest(n1), True])
+        self.assertEqual(self.q1_to_lower.get(timeout=2.0)[1].name, n1)
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, md[0]])
+
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunks[1]])
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunks[0]])
+        r1: ContentRange = self.q1_to_higher.get(timeout=2.0)[1]
+        self.assertEqual((r1.offset, r1.data, r1.content_size, r1.last), (0, b"A" * 4096 + b"B" * 4096, 12388, False))
+        self.assertIsNone(self.chunkLayer._request_table.get(n1).buffer)
+
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunks[3]])
+        time.sleep(0.1)
+        self.assertTrue(self.q1_to_higher.empty())
+        self.chunkLayer.data_from_lower(self.q1_to_lower, self.q1_to_higher, [0, chunks[2]])
+        r2: ContentRange = self.q1_to_higher.get(timeout=2.0)[1]
+        self.assertEqual((r2.offset, r2.data, r2.last), (8192, b"C" * 4096 + b"D" * 100, True))
+        self.assertEqual(len(self.chunkLayer._request_table), 0)
@@ -0,0 +1,53 @@
+"""Tests for the request table of the chunk layer"""
+
+import unittest
+
+from PiCN.Layers.ChunkLayer import RequestTable, RequestTableEntry
+from PiCN.Packets import Name
+
+
+class test_RequestTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = RequestTable()
+
+    def tearDown(self):
+        pass
+
+    def test_get_entry_by_chunk_and_metadata_name(self):
+        """Test finding an entry by request, chunk and metadata name"""
+        entry = RequestTableEntry(Name("/test/data"))
+        self.table.append(entry)
+        self.table.add_requested_chunk(entry, Name("/test/data/c0"))
+        self.table.add_requested_metadata(entry, Name("/test/data/m1"))
+
+        self.assertIs(self.table.get(Name("/test/data")), entry)
+        self.assertIs(self.table.get(Name("/test/data/c0")), entry)
+        self.assertIs(self.table.get(Name("/test/data/m1")), entry)
+        self.assertIsNone(self.table.get(Name("/test/data/c1")))
+        self.assertTrue(self.table.is_chunk_requested(Name("/test/data/c0")))
+        self.assertTrue(self.table.is_metadata_requested(Name("/test/data/m1")))
+
+    def test_remove_chunk_name(self):
+        """Test removing a chunk name from an entry"""
+        entry = RequestTableEntry(Name("/test/data"))
+        entry.requested_chunks = dict.fromkeys([Name("/test/data/c0"), Name("/test/data/c1")])
+        self.table.append(entry)
+
+        self.table.remove_requested_chunk(entry, Name("/test/data/c0"))
+        self.assertFalse(self.table.is_chunk_requested(Name("/test/data/c0")))
+        self.assertTrue(self.table.is_chunk_requested(Name("/test/data/c1")))
+        self.assertEqual(list(entry.requested_chunks), [Name("/test/data/c1")])
+
+    def test_remove_entry(self):
+        """Test that removing an entry removes all its indexed names"""
+        entry = RequestTableEntry(Name("/test/data"))
+        entry.requested_chunks = dict.fromkeys([Name("/test/data/c0")])
+        entry.requested_md = dict.fromkeys([Name("/test/data/m1")])
+        self.table.append(entry)
+        self.assertEqual(len(self.table), 1)
+
+        self.table.remove(entry)
+        self.assertEqual(len(self.table), 0)
+        self.assertIsNone(self.table.get(Name("/test/data/c0")))
+        self.assertIsNone(self.table.get(Name("/test/data/m1")))
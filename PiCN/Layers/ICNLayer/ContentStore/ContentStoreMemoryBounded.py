@@ -0,0 +1,74 @@
+""" An in-memory content store with exact matching, bounded in size"""
+
+import time
+from collections import OrderedDict
+from typing import Dict
+
+from PiCN.Packets import Content, Name
+from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+
+
+class ContentStoreMemoryBounded(BaseContentStore):
+    """ A in memory Content Store using exact matching, indexed by name.
+    The entries are ordered by their timestamp, oldest first. If the stored content exceeds max_bytes, the oldest
+    entries are evicted. Entries older than cs_timeout are evicted by ageing and on insertion.
+    Static entries are neither evicted nor counted.
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param max_bytes: Maximum number of content bytes stored in the CS
+    """
+
+    def __init__(self, cs_timeout: int=10, max_bytes: int=256*1024*1024):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout)
+        self._container: Dict[Name, ContentStoreEntry] = OrderedDict()
+        self._static_container: Dict[Name, ContentStoreEntry] = {}
+        self._max_bytes = max_bytes
+        self._size = 0
+
+    def find_content_object(self, name: Name) -> ContentStoreEntry:
+        entry = self._container.get(name)
+        if entry is None:
+            return self._static_container.get(name)
+        if entry.timestamp + self._cs_timeout < time.time():
+            self.remove_content_object(name)
+            return None
+        return entry
+
+    def add_content_object(self, content: Content, static: bool=False):
+        if content.name in self._container or content.name in self._static_container:
+            return
+        if static:
+            self._static_container[content.name] = ContentStoreEntry(content, static=True)
+            return
+        self._container[content.name] = ContentStoreEntry(content)
+        self._size += len(content.get_bytes())
+        self.ageing()
+
+    def remove_content_object(self, name: Name):
+        entry = self._container.pop(name, None)
+        if entry is not None:
+            self._size -= len(entry.content.get_bytes())
+            return
+        self._static_container.pop(name, None)
+
+    def update_timestamp(self, cs_entry: ContentStoreEntry):
+        cs_entry.timestamp = time.time()
+        if cs_entry.name in self._container:
+            self._container.move_to_end(cs_entry.name)
+
+    def ageing(self):
+        """Evict expired entries and the oldest entries exceeding the size limit"""
+        timeout = time.time() - self._cs_timeout
+        while len(self._container) > 0:
+            name, entry = next(iter(self._container.items()))
+            if entry.timestamp >= timeout and self._size <= self._max_bytes:
+                break
+            self.remove_content_object(name)
+
+    def get_container_size(self) -> int:
+        return len(self._container) + len(self._static_container)
+
+    def get_size(self) -> int:
+        """get the number of content bytes stored in the CS, static entries are not counted
+        :return: number of bytes
+        """
+        return self._size
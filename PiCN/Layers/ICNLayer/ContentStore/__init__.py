@@ -1,4 +1,5 @@
 from .BaseContentStore import BaseContentStore
 from .BaseContentStore import ContentStoreEntry
 from .ContentStoreMemoryExact import ContentStoreMemoryExact
+from .ContentStoreMemoryBounded import ContentStoreMemoryBounded
 from .ContentStorePersistentExact import ContentStorePersistentExact
\ No newline at end of file
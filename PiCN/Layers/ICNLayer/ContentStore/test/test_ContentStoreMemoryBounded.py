@@ -0,0 +1,73 @@
+"""Tests for the bounded in Memory Content Store"""
+
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryBounded
+from PiCN.Packets import Content, Name
+
+
+class test_ContentStoreMemoryBounded(unittest.TestCase):
+
+    def setUp(self):
+        self.cs = ContentStoreMemoryBounded(cs_timeout=10, max_bytes=20)
+
+    def tearDown(self):
+        pass
+
+    def test_add_and_find_content(self):
+        """Test adding and searching data in the CS"""
+        c1 = Content("/test/data", "Hello")
+        c2 = Content("/data/test", "World")
+        self.cs.add_content_object(c1)
+        self.cs.add_content_object(c2)
+        self.assertEqual(self.cs.find_content_object(c1.name).content, c1)
+        self.assertEqual(self.cs.find_content_object(c2.name).content, c2)
+        self.assertIsNone(self.cs.find_content_object(Name("/test/other")))
+        self.assertEqual(self.cs.get_container_size(), 2)
+        self.assertEqual(self.cs.get_size(), 10)
+
+    def test_remove_content(self):
+        """Test adding and removing data from the CS"""
+        c = Content("/test/data", "Hello")
+        self.cs.add_content_object(c)
+        self.cs.remove_content_object(c.name)
+        self.assertIsNone(self.cs.find_content_object(c.name))
+        self.assertEqual(self.cs.get_container_size(), 0)
+        self.assertEqual(self.cs.get_size(), 0)
+
+    def test_evict_oldest_if_full(self):
+        """Test that the oldest entries are evicted if the size limit is exceeded"""
+        c1 = Content("/test/c1", "A" * 8)
+        c2 = Content("/test/c2", "B" * 8)
+        c3 = Content("/test/c3", "C" * 8)
+        self.cs.add_content_object(c1)
+        self.cs.add_content_object(c2)
+        self.cs.update_timestamp(self.cs.find_content_object(c1.name))
+        self.cs.add_content_object(c3)
+        self.assertIsNone(self.cs.find_content_object(c2.name))
+        self.assertEqual(self.cs.find_content_object(c1.name).content, c1)
+        self.assertEqual(self.cs.find_content_object(c3.name).content, c3)
+        self.assertEqual(self.cs.get_size(), 16)
+
+    def test_static_content_not_evicted(self):
+        """Test that static entries are neither evicted nor counted"""
+        c1 = Content("/test/c1", "A" * 30)
+        c2 = Content("/test/c2", "B" * 8)
+        self.cs.add_content_object(c1, static=True)
+        self.cs.add_content_object(c2)
+        self.cs.set_cs_timeout(0)
+        time.sleep(0.01)
+        self.cs.ageing()
+        self.assertEqual(self.cs.find_content_object(c1.name).content, c1)
+        self.assertIsNone(self.cs.find_content_object(c2.name))
+        self.assertEqual(self.cs.get_size(), 0)
+
+    def test_expired_content_not_found(self):
+        """Test that expired entries are not returned"""
+        c = Content("/test/data", "Hello")
+        self.cs.add_content_object(c)
+        self.cs.set_cs_timeout(0)
+        time.sleep(0.01)
+        self.assertIsNone(self.cs.find_content_object(c.name))
+        self.assertEqual(self.cs.get_container_size(), 0)
@@ -102,7 +102,8 @@ class Name(object):
         return Name(components)
 
     def __hash__(self) -> int:
-        return self._components.__str__().__hash__()
+        # names with differently split components are equal if their string representation is equal
+        return self.to_string().__hash__()
 
     def __len__(self):
         return len(self._components)
@@ -65,3 +65,11 @@ class TestName(unittest.TestCase):
         n += 'data'
         self.assertEqual([b'test', b'data'], n._components)
         self.assertEqual('/test/data', n.components_to_string())
+
+    def test_equal_names_same_hash(self):
+        """Test that equal names with differently split components can be used as dict keys"""
+        n1 = Name([b'lib', b'f1', b'_(/test/data)', b'NFN'])
+        n2 = Name('/lib/f1/_(/test/data)/NFN')
+        self.assertEqual(n1, n2)
+        self.assertEqual(hash(n1), hash(n2))
+        self.assertNotEqual(hash(n2), hash(Name('/lib/f1/_(/test/data)/NFN').setDigest(b'\x01')))
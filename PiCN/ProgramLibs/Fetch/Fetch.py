@@ -1,8 +1,16 @@
 """Fetch Tool for PiCN"""
 
+import heapq
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, TimeoutError, wait
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
 from PiCN.LayerStack import LayerStack
 from PiCN.Layers.AutoconfigLayer import AutoconfigClientLayer
-from PiCN.Layers.ChunkLayer import BasicChunkLayer
+from PiCN.Layers.ChunkLayer import BasicChunkLayer, ContentRange
 from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
 from PiCN.Layers.ChunkLayer.Chunkifyer import SimpleContentChunkifyer
 from PiCN.Layers.LinkLayer import BasicLinkLayer
@@ -11,11 +19,24 @@ from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo
 from PiCN.Processes.PiCNSyncDataStructFactory import PiCNSyncDataStructFactory
 from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder
 from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
-from PiCN.Packets import Content, Name, Interest, Nack
+from PiCN.Packets import Content, Name, Interest, Nack, Packet
 from PiCN.Layers.TimeoutPreventionLayer import BasicTimeoutPreventionLayer, TimeoutPreventionMessageDict
 
+class NackReceivedError(Exception):
+    """A Nack was received instead of the requested content"""
+
+    def __init__(self, nack: Nack):
+        super().__init__("Received Nack: " + str(nack.reason.value))
+        self.nack = nack
+
+
 class Fetch(object):
-    """Fetch Tool for PiCN"""
+    """Fetch Tool for PiCN
+    Many requests can be outstanding at the same time, a dispatcher thread matches the responses by name to the
+    waiting requests and fails requests whose timeout passed.
+    """
+
+    _dispatch_interval = 0.1 # maximum time between two checks of the dispatcher for stopping
 
     def __init__(self, ip: str, port: int, log_level=255, encoder: BasicEncoder=None, autoconfig: bool = False,
                  interfaces=None):
@@ -64,32 +85,196 @@ class Fetch(object):
         else:
             self.fid = self.linklayer.faceidtable.get_or_create_faceid(AddressInfo((ip, port), 0))
 
+        # pending requests by name, futures or queues of streaming requests
+        self._pending: Dict[Name, List[Union[Future, queue.Queue]]] = {}
+        self._pending_lock = threading.Lock()
+        self._deadlines: List[Tuple[float, int, Name, Future]] = []
+        self._deadline_seq = itertools.count()
+
         # send packet
         self.lstack.start_all()
+        self._dispatching = True
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
 
     def fetch_data(self, name: Name, timeout=4.0) -> str:
         """Fetch data from the server
         :param name Name to be fetched
         :param timeout Timeout to wait for a response. Use 0 for infinity
         """
-        # create interest
-        interest: Interest = Interest(name)
-        if self.autoconfig:
-            self.lstack.queue_from_higher.put([None, interest])
-        else:
-            self.lstack.queue_from_higher.put([self.fid, interest])
-
-        if timeout == 0:
-            packet = self.lstack.queue_to_higher.get()[1]
-        else:
-            packet = self.lstack.queue_to_higher.get(timeout=timeout)[1]
+        future = self.fetch_future(name, timeout)
+        try:
+            packet = future.result()
+        except TimeoutError:
+            raise queue.Empty()
+        except NackReceivedError as e:
+            return str(e)
         if isinstance(packet, Content):
             return packet.content
-        if isinstance(packet, Nack):
-            return "Received Nack: " + str(packet.reason.value)
         return None
 
+    def fetch_future(self, name: Name, timeout=4.0) -> Future:
+        """Send an Interest and return a future for the response without waiting for it.
+        The result of the future is the Content, a Nack raises NackReceivedError and a timeout raises TimeoutError.
+        :param name Name to be fetched
+        :param timeout Timeout to wait for a response. Use 0 for infinity
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        deadline = None if timeout == 0 else time.time() + timeout
+        with self._pending_lock:
+            self._pending.setdefault(name, []).append(future)
+            if deadline is not None:
+                heapq.heappush(self._deadlines, (deadline, next(self._deadline_seq), name, future))
+        self._send_interest(Interest(name))
+        return future
+
+    def fetch_many(self, names: Iterable[Name], timeout=4.0, max_outstanding: int=1000) \
+            -> Iterator[Tuple[Name, Optional[Packet]]]:
+        """Fetch many names with up to max_outstanding Interests in flight, yields (name, response) as the responses
+        arrive. The response is the Content or Nack, None if the request timed out.
+        :param names Names to be fetched
+        :param timeout Timeout to wait for each response. Use 0 for infinity
+        :param max_outstanding maximum number of Interests in flight
+        """
+        names = iter(names)
+        outstanding: Dict[Future, Name] = {}
+        while True:
+            for name in itertools.islice(names, max_outstanding - len(outstanding)):
+                outstanding[self.fetch_future(name, timeout)] = name
+            if len(outstanding) == 0:
+                return
+            done, _ = wait(outstanding, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = outstanding.pop(future)
+                try:
+                    yield (name, future.result())
+                except NackReceivedError as e:
+                    yield (name, e.nack)
+                except TimeoutError:
+                    yield (name, None)
+
+    def fetch_bytes(self, name: Name, timeout=4.0) -> bytes:
+        """Fetch data from the server as bytes, raises NackReceivedError if a Nack is received
+        :param name Name to be fetched
+        :param timeout Timeout to wait for the next part of the response. Use 0 for infinity
+        """
+        return b"".join(self.fetch_stream(name, timeout))
+
+    def fetch_stream(self, name: Name, timeout=4.0) -> Iterator[bytes]:
+        """Fetch data from the server, yields contiguous byte ranges in order as soon as they are available.
+        Raises NackReceivedError if a Nack is received.
+        :param name Name to be fetched
+        :param timeout Timeout to wait for the next part of the response. Use 0 for infinity
+        """
+        parts = queue.Queue()
+        with self._pending_lock:
+            self._pending.setdefault(name, []).append(parts)
+        try:
+            self._send_interest(Interest(name), stream=True)
+            while True:
+                if timeout == 0:
+                    packet = parts.get()
+                else:
+                    packet = parts.get(timeout=timeout)
+                if isinstance(packet, ContentRange):
+                    if len(packet) > 0:
+                        yield packet.data
+                    if packet.last:
+                        return
+                elif isinstance(packet, Content):
+                    yield packet.get_bytes()
+                    return
+                elif isinstance(packet, Nack):
+                    raise NackReceivedError(packet)
+        finally:
+            self._remove_pending(name, parts)
+
+    def fetch_to_file(self, name: Name, file: BinaryIO, timeout=4.0) -> int:
+        """Fetch data from the server and write it to a file or mmap at its current position while it is received
+        :param name Name to be fetched
+        :param file writable binary file object or mmap
+        :param timeout Timeout to wait for the next part of the response. Use 0 for infinity
+        :return number of bytes written
+        """
+        size = 0
+        for data in self.fetch_stream(name, timeout):
+            file.write(data)
+            size += len(data)
+        return size
+
     def stop_fetch(self):
         """Close everything"""
+        self._dispatching = False
+        self._dispatcher.join()
+        with self._pending_lock:
+            pending = [h for handles in self._pending.values() for h in handles]
+            self._pending.clear()
+            self._deadlines.clear()
+        for handle in pending:
+            if isinstance(handle, Future):
+                handle.cancel()
         self.lstack.stop_all()
         self.lstack.close_all()
+
+    def _send_interest(self, interest: Interest, stream: bool=False):
+        """hand an Interest to the layer stack"""
+        fid = None if self.autoconfig else self.fid
+        if stream:
+            self.lstack.queue_from_higher.put([fid, interest, True])
+        else:
+            self.lstack.queue_from_higher.put([fid, interest])
+
+    def _remove_pending(self, name: Name, handle):
+        """remove a request from the pending requests"""
+        with self._pending_lock:
+            handles = self._pending.get(name)
+            if handles is not None and handle in handles:
+                handles.remove(handle)
+                if len(handles) == 0:
+                    del self._pending[name]
+
+    def _expire_pending(self) -> Optional[float]:
+        """fail the futures whose timeout passed, returns the next deadline"""
+        expired = []
+        now = time.time()
+        with self._pending_lock:
+            while len(self._deadlines) > 0 and (self._deadlines[0][0] <= now or self._deadlines[0][3].done()):
+                _, _, name, future = heapq.heappop(self._deadlines)
+                handles = self._pending.get(name)
+                if handles is not None and future in handles:
+                    expired.append((name, future))
+                    handles.remove(future)
+                    if len(handles) == 0:
+                        del self._pending[name]
+            next_deadline = self._deadlines[0][0] if len(self._deadlines) > 0 else None
+        for name, future in expired:
+            future.set_exception(TimeoutError("No response for " + name.to_string()))
+        return next_deadline
+
+    def _dispatch(self):
+        """receive responses from the layer stack and hand them to the pending requests with the same name"""
+        while self._dispatching:
+            next_deadline = self._expire_pending()
+            wait_time = self._dispatch_interval
+            if next_deadline is not None:
+                wait_time = max(0.0, min(wait_time, next_deadline - time.time()))
+            try:
+                packet = self.lstack.queue_to_higher.get(timeout=wait_time)[1]
+            except queue.Empty:
+                continue
+            if isinstance(packet, ContentRange) and not packet.last:
+                with self._pending_lock:
+                    handles = [h for h in self._pending.get(packet.name, []) if isinstance(h, queue.Queue)]
+            else:
+                with self._pending_lock:
+                    handles = self._pending.pop(packet.name, [])
+            for handle in handles:
+                if isinstance(handle, queue.Queue):
+                    handle.put(packet)
+                elif handle.done():
+                    continue
+                elif isinstance(packet, Nack):
+                    handle.set_exception(NackReceivedError(packet))
+                else:
+                    handle.set_result(packet)
@@ -1,3 +1,3 @@
 """Fetch Tool for PiCN"""
 
-from .Fetch import Fetch
\ No newline at end of file
+from .Fetch import Fetch, NackReceivedError
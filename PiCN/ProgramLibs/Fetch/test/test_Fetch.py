@@ -1,12 +1,14 @@
 """Test a fetch from a repo over an ICN forwarder"""
 
 import abc
+import concurrent.futures
+import mmap
 import os
 import shutil
 import time
 import unittest
 
-from PiCN.ProgramLibs.Fetch import Fetch
+from PiCN.ProgramLibs.Fetch import Fetch, NackReceivedError
 from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
 
 from PiCN.Mgmt import MgmtClient
@@ -93,6 +95,78 @@ class cases_Fetch(object):
         content = self.fetch.fetch_data(Name("/test/data/f3"))
         self.assertEqual(content, self.data3)
 
+    def test_fetch_stream_over_forwarder(self):
+        """Test fetching a large data object as in order byte ranges"""
+        self.ICNRepo.start_repo()
+        self.forwarder.start_forwarder()
+        time.sleep(0.1)
+        self.add_face_and_forwadingrule()
+
+        ranges = list(self.fetch.fetch_stream(Name("/test/data/f3")))
+        self.assertGreater(len(ranges), 0)
+        self.assertEqual(b"".join(ranges), self.data3.encode())
+        self.assertEqual(self.fetch.fetch_bytes(Name("/test/data/f1")), self.data1.encode())
+
+    def test_fetch_to_file_and_mmap_over_forwarder(self):
+        """Test writing a fetched data object directly to a file and to a mmap"""
+        self.ICNRepo.start_repo()
+        self.forwarder.start_forwarder()
+        time.sleep(0.1)
+        self.add_face_and_forwadingrule()
+
+        with open(self.path + "/out", "wb") as f:
+            size = self.fetch.fetch_to_file(Name("/test/data/f3"), f)
+        self.assertEqual(size, len(self.data3))
+        with open(self.path + "/out", "rb") as f:
+            self.assertEqual(f.read(), self.data3.encode())
+
+        buffer = mmap.mmap(-1, len(self.data2))
+        self.assertEqual(self.fetch.fetch_to_file(Name("/test/data/f2"), buffer), len(self.data2))
+        self.assertEqual(buffer[:], self.data2.encode())
+        buffer.close()
+
+    def test_fetch_bytes_nack(self):
+        """Test that a Nack raises an error when fetching bytes"""
+        self.ICNRepo.start_repo()
+        self.forwarder.start_forwarder()
+        time.sleep(0.1)
+        self.add_face_and_forwadingrule()
+
+        with self.assertRaises(NackReceivedError) as cm:
+            self.fetch.fetch_bytes(Name("/other/data"))
+        self.assertEqual(cm.exception.nack.reason, NackReason.NO_ROUTE)
+
+    def test_fetch_many_over_forwarder(self):
+        """Test fetching many names with several Interests in flight, responses are matched by name"""
+        self.ICNRepo.start_repo()
+        self.forwarder.start_forwarder()
+        time.sleep(0.1)
+        self.add_face_and_forwadingrule()
+
+        names = [Name("/test/data/f1"), Name("/test/data/f3"), Name("/test/data/f2"), Name("/other/data")]
+        res = dict(self.fetch.fetch_many(names, max_outstanding=2))
+        self.assertEqual(len(res), 4)
+        self.assertEqual(res[names[0]].content, self.data1)
+        self.assertEqual(res[names[1]].content, self.data3)
+        self.assertEqual(res[names[2]].content, self.data2)
+        self.assertEqual(res[names[3]].reason, NackReason.NO_ROUTE)
+
+    def test_fetch_future_over_forwarder(self):
+        """Test the futures API with a reply, a Nack and a timeout"""
+        self.ICNRepo.start_repo()
+        self.forwarder.start_forwarder()
+        time.sleep(0.1)
+        self.add_face_and_forwadingrule()
+        self.mgmtClient.add_face("127.0.0.1", 1, 0)
+        self.mgmtClient.add_forwarding_rule(Name("/lost"), faceid=[1])
+
+        f1 = self.fetch.fetch_future(Name("/test/data/f3"))
+        f2 = self.fetch.fetch_future(Name("/other/data"))
+        f3 = self.fetch.fetch_future(Name("/lost/data"), timeout=0.5)
+        self.assertEqual(f1.result(timeout=5).content, self.data3)
+        self.assertRaises(NackReceivedError, f2.result, 5)
+        self.assertRaises(concurrent.futures.TimeoutError, f3.result, 5)
+
     def test_fetching_content_from_second_repo_after_nack(self):
         """Test sending an interest to forwarder with no matching content, choose second route to fetch content"""
         self.forwarder2: ICNForwarder = ICNForwarder(0,  encoder=self.get_encoder(), log_level=255)
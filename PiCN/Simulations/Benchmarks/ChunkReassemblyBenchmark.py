@@ -0,0 +1,42 @@
+"""Benchmark reassembling large chunked objects with the SimpleContentChunkifyer.
+Chunks arrive in random order and are written to a preallocated reassembly buffer, as done by the BasicChunkLayer.
+
+usage: python3 -m PiCN.Simulations.Benchmarks.ChunkReassemblyBenchmark [size in MB] [runs]
+"""
+
+import os
+import random
+import sys
+import time
+
+from PiCN.Layers.ChunkLayer.Chunkifyer import SimpleContentChunkifyer
+from PiCN.Packets import Content, Name
+
+
+def reassemble(chunkifyer: SimpleContentChunkifyer, metadata, chunks) -> Content:
+    """reassemble an object from its metadata and chunks using a preallocated buffer"""
+    _, _, size = chunkifyer.parse_meta_data(metadata[0].content)
+    buffer = chunkifyer.create_reassembly_buffer(int(size))
+    for c in chunks:
+        chunkifyer.insert_chunk(buffer, c)
+    return Content(metadata[0].name, buffer)
+
+
+def run(size_mb: int=100, runs: int=3):
+    chunkifyer = SimpleContentChunkifyer()
+    data = os.urandom(size_mb * 1024 * 1024)
+    metadata, chunks = chunkifyer.chunk_data(Content(Name("/bench/data"), data))
+    random.shuffle(chunks)
+    print("Object size: %d MB, %d chunks, %d metadata objects" % (size_mb, len(chunks), len(metadata)))
+    for i in range(0, runs):
+        start = time.perf_counter()
+        content = reassemble(chunkifyer, metadata, chunks)
+        duration = time.perf_counter() - start
+        assert content.get_bytes() == data
+        print("Run %d: %.3f s, %.1f MB/s" % (i, duration, size_mb / duration))
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    run(size_mb, runs)
@@ -0,0 +1 @@
+"""Benchmarks measuring the performance of PiCN components"""